@@ -1,11 +1,24 @@
 import sys
 import os
+import argparse
 import asyncio
-import json
+import logging
+import math
+import queue
+import threading
 import time
-import requests
-import websockets
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+
+try:
+    from orjson import loads
+except ImportError:
+    from json import loads
+
+try:
+    from uvloop import run   # libuv event loop; not available on Windows
+except ImportError:
+    from asyncio import run
 
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
 
@@ -15,16 +28,14 @@ if sys.platform == "win32":
 
 from rich.console import Console
 from rich.live import Live
+from rich.logging import RichHandler
 
 import config
 import feeds
 import dashboard
 
-# Trading imports
-from py_clob_client.client import ClobClient
-from py_clob_client.clob_types import OrderArgs, PartialCreateOrderOptions
-
 console = Console(force_terminal=True)
+log = logging.getLogger("main")
 
 # Environment for trading
 POLYMARKET_PRIVATE_KEY = os.environ.get("POLYMARKET_PRIVATE_KEY", "")
@@ -34,10 +45,13 @@ PROXY_URL = os.environ.get("PROXY_URL", "")
 
 class PriceData:
     """All price data in one place"""
+    __slots__ = ("cl_price", "cl_change_pct", "cl_start_price",
+                 "timestamp", "start_recorded")
+
     def __init__(self):
-        self.binance = {"price": 0, "bid": 0, "ask": 0}
-        self.chainlink = {"price": 0, "change_pct": 0, "start_price": 0}
-        self.polymarket = {"up_price": 0, "down_price": 0, "up_id": "", "down_id": ""}
+        self.cl_price = 0.0
+        self.cl_change_pct = 0.0
+        self.cl_start_price = 0.0
         self.timestamp = 0
         self.start_recorded = False
     
@@ -56,60 +70,61 @@ async def fetch_chainlink():
     
     # Method: Use Coingecko as proxy for Chainlink (they use similar feeds)
     try:
-        resp = requests.get(
+        resp = await feeds.http_client.get(
             "https://api.coingecko.com/api/v3/simple/price?ids=bitcoin&vs_currencies=usd&include_24hr_change=true",
             timeout=5
         )
-        data = resp.json()
+        data = loads(resp.content)
         cl_price = data.get("bitcoin", {}).get("usd", 0)
-        prices.chainlink["price"] = cl_price
-        prices.chainlink["change_pct"] = data.get("bitcoin", {}).get("usd_24h_change", 0)
+        prices.cl_price = cl_price
+        prices.cl_change_pct = data.get("bitcoin", {}).get("usd_24h_change", 0)
         
         # Record starting price on first fetch
         if cl_price > 0 and not prices.start_recorded:
-            prices.chainlink["start_price"] = cl_price
+            prices.cl_start_price = cl_price
             prices.start_recorded = True
             print(f"\n🎯 MARKET OPEN: ${cl_price:,.2f} (Price to beat)\n")
-    except:
+    except Exception:
         # Fallback to Binance
         try:
-            resp = requests.get("https://api.binance.com/api/v3/ticker/24hr?symbol=BTCUSDT", timeout=5)
-            data = resp.json()
+            resp = await feeds.http_client.get(
+                "https://api.binance.com/api/v3/ticker/24hr?symbol=BTCUSDT", timeout=5
+            )
+            data = loads(resp.content)
             cl_price = float(data.get("lastPrice", 0))
-            prices.chainlink["price"] = cl_price
-            prices.chainlink["change_pct"] = float(data.get("priceChangePercent", 0))
+            prices.cl_price = cl_price
+            prices.cl_change_pct = float(data.get("priceChangePercent", 0))
             
             if cl_price > 0 and not prices.start_recorded:
-                prices.chainlink["start_price"] = cl_price
+                prices.cl_start_price = cl_price
                 prices.start_recorded = True
                 print(f"\n🎯 MARKET OPEN: ${cl_price:,.2f} (Price to beat)\n")
-        except:
+        except Exception:
             pass
 
 
-async def fetch_binance(symbol: str):
-    """Fetch Binance price"""
-    try:
-        resp = requests.get(f"https://api.binance.com/api/v3/ticker/price?symbol={symbol}", timeout=5)
-        prices.binance["price"] = float(resp.json().get("price", 0))
-        
-        # Get order book for bid/ask
-        ob = requests.get(f"https://api.binance.com/api/v3/depth?symbol={symbol}&limit=5", timeout=5).json()
-        prices.binance["bid"] = float(ob["bids"][0][0]) if ob.get("bids") else 0
-        prices.binance["ask"] = float(ob["asks"][0][0]) if ob.get("asks") else 0
-    except Exception as e:
-        print(f"Binance error: {e}")
+def shares_for(amount: float, price: float) -> float:
+    # round up to the 0.01 share step so the order never falls below `amount`
+    return math.ceil(amount / price * 100) / 100
 
 
 class TradingBot:
     """Integrated trading bot"""
     def __init__(self):
         self.client = None
-        self.last_trade = 0
+        self.cooldown_until = 0.0
+        self.order_args = None   # py_clob_client OrderArgs, bound in init()
+        self.order_opts = None
         
     def init(self):
         if not POLYMARKET_PRIVATE_KEY:
             return False
+        # deferred: py_clob_client pulls in the web3 / eth_account stack,
+        # which read-only runs (no private key) never need
+        from py_clob_client.client import ClobClient
+        from py_clob_client.clob_types import OrderArgs, PartialCreateOrderOptions
+        self.order_args = OrderArgs
+        self.order_opts = PartialCreateOrderOptions(tick_size="0.01")
         try:
             client = ClobClient(
                 host="https://clob.polymarket.com",
@@ -127,27 +142,27 @@ class TradingBot:
             )
             return True
         except Exception as e:
-            print(f"CLOB init error: {e}")
+            log.error(f"CLOB init error: {e}")
             return False
     
-    def execute(self, token_id: str, side: str, price: float, amount: float = 5.0):
+    def execute(self, token_id: str, side: str, price: float, amount: float = config.TRADE_USD):
         if not self.client:
             print("❌ CLOB not initialized")
             return
         
-        if time.time() - self.last_trade < 300:
+        if time.monotonic() < self.cooldown_until:
             print("⏳ Cooldown active")
             return
         
-        size = round(amount / price, 2)
+        size = shares_for(amount, price)
         try:
             result = self.client.create_and_post_order(
-                OrderArgs(token_id=token_id, price=price, size=size, side=side),
-                PartialCreateOrderOptions(tick_size="0.01")
+                self.order_args(token_id=token_id, price=price, size=size, side=side),
+                self.order_opts
             )
             if result.get("success"):
                 print(f"✅ Order placed: {result.get('orderID', 'N/A')[:16]}...")
-                self.last_trade = time.time()
+                self.cooldown_until = time.monotonic() + config.TRADE_COOLDOWN
             else:
                 print(f"❌ Failed: {result}")
         except Exception as e:
@@ -176,15 +191,15 @@ async def display_loop(state: feeds.State, coin: str, tf: str):
     await asyncio.sleep(2)
     with Live(console=console, refresh_per_second=1, transient=False) as live:
         while True:
-            if state.mid > 0 and state.klines:
+            if state.dirty and state.mid > 0 and state.klines:
                 live.update(dashboard.render(state, coin, tf))
+                state.dirty = False
             await asyncio.sleep(config.REFRESH)
 
 
-async def price_poller(symbol: str):
-    """Poll all prices"""
+async def price_poller():
+    """Poll Chainlink proxy price (Binance comes from the WS/order book feeds)"""
     while True:
-        await fetch_binance(symbol)
         await fetch_chainlink()
         prices.update()
         await asyncio.sleep(5)
@@ -192,7 +207,7 @@ async def price_poller(symbol: str):
 
 async def trading_loop(state: feeds.State):
     """Background trading signals"""
-    min_spread = 0.015  # 1.5%
+    min_spread = config.MIN_SPREAD
     last_signal = None
     
     while True:
@@ -201,7 +216,7 @@ async def trading_loop(state: feeds.State):
             spread = state.pm_up - 0.5
             
             # Also compare to Chainlink 24h change as sentiment
-            cl_change = prices.chainlink.get("change_pct", 0) / 100
+            cl_change = prices.cl_change_pct / 100
             
             # Adjusted spread considering sentiment
             adjusted_spread = spread - (cl_change * 0.1)  # Small adjustment
@@ -215,19 +230,24 @@ async def trading_loop(state: feeds.State):
             
             if signal != last_signal and signal != "WAIT":
                 last_signal = signal
-                print(f"\n🎯 SIGNAL: {signal}")
-                print(f"   PM UP: {state.pm_up*100:.1f}% | CL 24h: {cl_change*100:.1f}%")
-                print(f"   Spread: {spread*100:+.1f}%\n")
+                print(f"\n🎯 SIGNAL: {signal}\n"
+                      f"   PM UP: {state.pm_up*100:.1f}% | CL 24h: {cl_change*100:.1f}%\n"
+                      f"   Spread: {spread*100:+.1f}%\n")
         
-        await asyncio.sleep(10)
+        # Wake on the next PM price update (or every 10s for CL drift)
+        try:
+            await asyncio.wait_for(state.pm_updated.wait(), timeout=10)
+        except asyncio.TimeoutError:
+            pass
+        state.pm_updated.clear()
 
 
 async def print_prices(state: feeds.State):
     """Print price summary with trading signals"""
     while True:
         try:
-            start_price = prices.chainlink.get("start_price", 0)
-            current_price = prices.chainlink.get("price", 0)
+            start_price = prices.cl_start_price
+            current_price = prices.cl_price
             price_change = ((current_price - start_price) / start_price * 100) if start_price > 0 and current_price > 0 else 0
             
             pm_up = state.pm_up if hasattr(state, 'pm_up') and state.pm_up else 0
@@ -238,33 +258,56 @@ async def print_prices(state: feeds.State):
             pm_implied = pm_up
             edge = pm_implied - actual_implied
             
-            print(f"\n{'='*55}")
-            print(f"📊 TRADING DASHBOARD @ {datetime.now().strftime('%H:%M:%S')}")
-            print(f"{'='*55}")
-            print(f"  💰 CHAINLINK (Price to Beat)")
-            print(f"     Start: ${start_price:,.2f}" if start_price > 0 else "     Start: Waiting...")
-            print(f"     Now:   ${current_price:,.2f}" if current_price > 0 else "     Now:   Waiting...")
-            print(f"     Δ:    {price_change:+.2f}%")
-            print(f"\n  📈 POLYMARKET")
-            print(f"     UP:   {pm_up*100:.1f}% | DOWN: {pm_down*100:.1f}%")
-            print(f"\n  🎯 SIGNALS")
-            print(f"     PM Implied: {pm_implied*100:.1f}%")
-            print(f"     Actual Δ:   {actual_implied*100:.1f}%")
-            print(f"     Edge:       {edge*100:+.1f}% {'✅ BUY UP' if edge < -0.015 else '✅ BUY DOWN' if edge > 0.015 else '⚪ WAIT'}")
-            print(f"{'='*55}\n")
+            rule  = "=" * 55
+            start = f"${start_price:,.2f}" if start_price > 0 else "Waiting..."
+            now   = f"${current_price:,.2f}" if current_price > 0 else "Waiting..."
+            sig   = "✅ BUY UP" if edge < -config.MIN_SPREAD else "✅ BUY DOWN" if edge > config.MIN_SPREAD else "⚪ WAIT"
+            # One write for the whole block instead of a print (and flush) per line
+            sys.stdout.write(
+                f"\n{rule}\n"
+                f"📊 TRADING DASHBOARD @ {datetime.now().strftime('%H:%M:%S')}\n"
+                f"{rule}\n"
+                f"  💰 CHAINLINK (Price to Beat)\n"
+                f"     Start: {start}\n"
+                f"     Now:   {now}\n"
+                f"     Δ:    {price_change:+.2f}%\n"
+                f"\n  📈 POLYMARKET\n"
+                f"     UP:   {pm_up*100:.1f}% | DOWN: {pm_down*100:.1f}%\n"
+                f"\n  🎯 SIGNALS\n"
+                f"     PM Implied: {pm_implied*100:.1f}%\n"
+                f"     Actual Δ:   {actual_implied*100:.1f}%\n"
+                f"     Edge:       {edge*100:+.1f}% {sig}\n"
+                f"{rule}\n\n"
+            )
+            sys.stdout.flush()
         except Exception as e:
-            print(f"Display error: {e}")
+            log.error(f"Display error: {e}")
         
         await asyncio.sleep(15)
 
 
+def _read_stdin(loop: asyncio.AbstractEventLoop, lines: asyncio.Queue):
+    # daemon thread: never joined at shutdown, so a pending read can't hang exit
+    while True:
+        line = sys.stdin.readline()
+        loop.call_soon_threadsafe(lines.put_nowait, line)
+        if not line:
+            return
+
+
 async def command_input(state: feeds.State):
     """Handle keyboard commands with feedback"""
     last_trade_info = {"side": None, "price": 0, "size": 0, "time": 0}
+    lines: asyncio.Queue = asyncio.Queue()
+    threading.Thread(target=_read_stdin, args=(asyncio.get_running_loop(), lines),
+                     daemon=True).start()
     
     while True:
         try:
-            cmd = input().strip().upper()
+            line = await lines.get()
+            if not line:
+                raise EOFError
+            cmd = line.strip().upper()
             
             if cmd == "Q" or cmd == "QUIT":
                 print("\n👋 Stopping bot...")
@@ -273,17 +316,17 @@ async def command_input(state: feeds.State):
             elif cmd == "UP":
                 if state.pm_up_id and state.pm_up:
                     price = state.pm_up
-                    shares = round(5.0 / price, 2)  # $5 fixed
+                    shares = shares_for(config.TRADE_USD, price)
                     
                     print(f"\n{'='*50}")
-                    print("🚀 BUYING UP ($5)")
+                    print(f"🚀 BUYING UP (${config.TRADE_USD:g})")
                     print(f"{'='*50}")
                     print(f"  Price: ${price:.4f}")
                     print(f"  Shares: {shares}")
                     print(f"  Total: ${shares * price:.2f}")
                     print(f"{'='*50}")
                     
-                    trading_bot.execute(state.pm_up_id, "BUY", price, 5.0)
+                    await asyncio.to_thread(trading_bot.execute, state.pm_up_id, "BUY", price, config.TRADE_USD)
                     
                     last_trade_info = {"side": "UP", "price": price, "shares": shares, "time": time.time()}
                 else:
@@ -292,17 +335,17 @@ async def command_input(state: feeds.State):
             elif cmd == "DN" or cmd == "DOWN":
                 if state.pm_dn_id and state.pm_dn:
                     price = state.pm_dn
-                    shares = round(5.0 / price, 2)  # $5 fixed
+                    shares = shares_for(config.TRADE_USD, price)
                     
                     print(f"\n{'='*50}")
-                    print("🚀 BUYING DOWN ($5)")
+                    print(f"🚀 BUYING DOWN (${config.TRADE_USD:g})")
                     print(f"{'='*50}")
                     print(f"  Price: ${price:.4f}")
                     print(f"  Shares: {shares}")
                     print(f"  Total: ${shares * price:.2f}")
                     print(f"{'='*50}")
                     
-                    trading_bot.execute(state.pm_dn_id, "BUY", price, 5.0)
+                    await asyncio.to_thread(trading_bot.execute, state.pm_dn_id, "BUY", price, config.TRADE_USD)
                     
                     last_trade_info = {"side": "DOWN", "price": price, "shares": shares, "time": time.time()}
                 else:
@@ -312,7 +355,7 @@ async def command_input(state: feeds.State):
                 print(f"\n{'='*50}")
                 print("[TRADE STATUS]")
                 print(f"{'='*50}")
-                print(f"  Binance: ${prices.binance['price']:,.2f}")
+                print(f"  Binance: ${state.mid:,.2f}")
                 print(f"  PM UP:   {state.pm_up*100:.1f}% | DOWN: {state.pm_dn*100:.1f}%")
                 
                 if last_trade_info["time"] > 0:
@@ -331,12 +374,54 @@ async def command_input(state: feeds.State):
         except EOFError:
             break
         except Exception as e:
-            print(f"Input error: {e}")
+            log.error(f"Input error: {e}")
         
         await asyncio.sleep(0.1)
 
 
+def setup_logging() -> QueueListener:
+    """Log via a queue so terminal writes happen on a background thread"""
+    q = queue.SimpleQueue()
+    # write through the shared console so lines land above the Live dashboard
+    out = RichHandler(console=console, show_time=False, show_level=False, show_path=False)
+    out.setFormatter(logging.Formatter("%(message)s"))
+    listener = QueueListener(q, out)
+    root = logging.getLogger()
+    root.addHandler(QueueHandler(q))
+    root.setLevel(logging.INFO)
+    # httpx/httpcore log every request at INFO – keep the poll loops quiet
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    logging.getLogger("httpcore").setLevel(logging.WARNING)
+    listener.start()
+    return listener
+
+
+async def supervise(name: str, factory, backoff_max: float = 30):
+    """Run factory() until it returns, restarting only this task on failure"""
+    backoff = 1
+    while True:
+        started = time.monotonic()
+        try:
+            return await factory()
+        except Exception as e:
+            if time.monotonic() - started > backoff_max:
+                backoff = 1
+            log.error(f"  [{name}] crashed ({e}) – restarting in {backoff}s")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, backoff_max)
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Crypto prediction dashboard")
+    p.add_argument("--coin", type=str.upper, choices=config.COINS,
+                   default=os.environ.get("COIN", "").upper() or None)
+    p.add_argument("--tf", choices=config.TIMEFRAMES, default=os.environ.get("TF"))
+    return p.parse_args()
+
+
 async def main():
+    args = parse_args()
+    listener = setup_logging()
     console.print("\n[bold magenta]═══ CRYPTO PREDICTION DASHBOARD ═══[/bold magenta]\n")
 
     if POLYMARKET_PRIVATE_KEY and trading_bot.init():
@@ -344,14 +429,23 @@ async def main():
     else:
         console.print("  [yellow]⚠️ Set POLYMARKET_PRIVATE_KEY for trading[/yellow]")
 
-    coin = pick("Select coin:", config.COINS)
-    tf = pick("Select timeframe:", config.TIMEFRAMES)
+    # flags / env vars skip the menu for scripted launches
+    coin = args.coin if args.coin in config.COINS else pick("Select coin:", config.COINS)
+    tf = args.tf if args.tf in config.TIMEFRAMES else pick("Select timeframe:", config.TIMEFRAMES)
 
     console.print(f"\n[bold green]Starting {coin} {tf} …[/bold green]\n")
 
     state = feeds.State()
-    state.pm_up_id, state.pm_dn_id = feeds.fetch_pm_tokens(coin, tf)
-    
+    binance_sym = config.COIN_BINANCE[coin]
+    kline_iv = config.TF_KLINE[tf]
+
+    # PM token lookup and candle bootstrap are independent – run them together
+    console.print("  [Binance] bootstrapping candles …")
+    (state.pm_up_id, state.pm_dn_id), _ = await asyncio.gather(
+        feeds.fetch_pm_tokens(coin, tf),
+        feeds.bootstrap(binance_sym, kline_iv, state),
+    )
+
     if state.pm_up_id:
         console.print(f"  [PM] Up   → {state.pm_up_id[:24]}…")
         console.print(f"  [PM] Down → {state.pm_dn_id[:24]}…")
@@ -359,24 +453,21 @@ async def main():
     else:
         console.print("  [yellow][PM] no market for this coin/timeframe[/yellow]")
 
-    binance_sym = config.COIN_BINANCE[coin]
-    kline_iv = config.TF_KLINE[tf]
-    console.print("  [Binance] bootstrapping candles …")
-    await feeds.bootstrap(binance_sym, kline_iv, state)
-
     console.print("\n  Commands: [UP] buy UP | [DN] buy DOWN | [Q] quit\n")
 
-    await asyncio.gather(
-        feeds.ob_poller(binance_sym, state),
-        feeds.binance_feed(binance_sym, kline_iv, state),
-        feeds.pm_feed(state),
-        display_loop(state, coin, tf),
-        trading_loop(state),
-        price_poller(binance_sym),
-        print_prices(state),
-        command_input(state),
-    )
+    try:
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(supervise("Binance WS", lambda: feeds.binance_feed(binance_sym, kline_iv, state)))
+            tg.create_task(supervise("PM",         lambda: feeds.pm_feed(state)))
+            tg.create_task(supervise("display",    lambda: display_loop(state, coin, tf)))
+            tg.create_task(supervise("trading",    lambda: trading_loop(state), backoff_max=1))
+            tg.create_task(supervise("prices",     price_poller))
+            tg.create_task(supervise("status",     lambda: print_prices(state)))
+            tg.create_task(supervise("input",      lambda: command_input(state)))
+    finally:
+        await feeds.http_client.aclose()
+        listener.stop()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
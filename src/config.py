@@ -28,6 +28,14 @@ KLINE_BOOT   = 100         # candles fetched on startup
 # ── Polymarket ──────────────────────────────────────────────────
 PM_GAMMA = "https://gamma-api.polymarket.com/events"
 PM_WS    = "wss://ws-subscriptions-clob.polymarket.com/ws/market"
+PM_RECONNECT_MIN = 1        # seconds – first WS reconnect delay
+PM_RECONNECT_MAX = 30       # seconds – backoff cap
+PM_WS_MAX_SIZE   = 4 << 20  # bytes – full book snapshots can exceed the 1 MiB default
+
+# ── Trading ─────────────────────────────────────────────────────
+TRADE_USD      = 5.0        # fixed order notional ($)
+TRADE_COOLDOWN = 300        # seconds between orders
+MIN_SPREAD     = 0.015      # PM edge vs 50 % needed for a signal
 
 # ── Orderbook indicators ───────────────────────────────────────
 OBI_BAND_PCT = 1.0          # % band around mid for OBI calc
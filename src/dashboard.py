@@ -35,48 +35,80 @@ def _col(val):
 
 TREND_THRESH = 3
 
-
-def _score_trend(st):
+BAR_W = 14
+_BARS = tuple("█" * i + "░" * (BAR_W - i) for i in range(BAR_W + 1))
+
+# static row labels, formatted once
+_DEPTH_LABELS = {pct: f"Depth {pct}%" for pct in config.DEPTH_BANDS}
+_CVD_LABELS   = {s: f"CVD {s // 60}m" for s in config.CVD_WINDOWS}
+
+
+# Kline indicators only change when a candle closes (state.klines gains a new
+# last element), so compute them once per close instead of per panel per render.
+_kl_last = None
+_kl_vals: dict = {}
+
+
+def _kl(klines) -> dict:
+    global _kl_last, _kl_vals
+    last = klines[-1] if klines else None
+    if last is None or last is not _kl_last:
+        _kl_last = last
+        _kl_vals = {
+            "rsi":  ind.rsi(klines),
+            "macd": ind.macd(klines),
+            "vwap": ind.vwap(klines),
+            "emas": ind.emas(klines),
+            "ha":   ind.heikin_ashi(klines),
+            "vp":   ind.vol_profile(klines),
+        }
+        _kl_vals["ha_g3"] = sum(c["green"] for c in _kl_vals["ha"][-3:])
+        poc, vp = _kl_vals["vp"]
+        if vp:
+            _kl_vals["vp_max"] = max(v for _, v in vp) or 1
+            _kl_vals["vp_poc"] = min(range(len(vp)), key=lambda i: abs(vp[i][0] - poc))
+    return _kl_vals
+
+
+def _score_trend(st, sn):
     score = 0
 
-    obi_v = ind.obi(st.bids, st.asks, st.mid) if st.mid else 0.0
+    obi_v = sn["obi"]
     if obi_v > config.OBI_THRESH:
         score += 1
     elif obi_v < -config.OBI_THRESH:
         score -= 1
 
-    cvd5 = ind.cvd(st.trades, 300)
+    cvd5 = sn["cvd5"]
     score += 1 if cvd5 > 0 else -1 if cvd5 < 0 else 0
 
-    rsi_v = ind.rsi(st.klines)
+    rsi_v = sn["rsi"]
     if rsi_v is not None:
         if rsi_v > config.RSI_OB:
             score -= 1
         elif rsi_v < config.RSI_OS:
             score += 1
 
-    _, _, hv = ind.macd(st.klines)
+    _, _, hv = sn["macd"]
     if hv is not None:
         score += 1 if hv > 0 else -1
 
-    vwap_v = ind.vwap(st.klines)
+    vwap_v = sn["vwap"]
     if vwap_v and st.mid:
         score += 1 if st.mid > vwap_v else -1
 
-    es, el = ind.emas(st.klines)
+    es, el = sn["emas"]
     if es is not None and el is not None:
         score += 1 if es > el else -1
 
-    bw, aw = ind.walls(st.bids, st.asks)
+    bw, aw = sn["walls"]
     score += min(len(bw), 2)
     score -= min(len(aw), 2)
 
-    ha = ind.heikin_ashi(st.klines)
-    if len(ha) >= 3:
-        last3 = ha[-3:]
-        if all(c["green"] for c in last3):
+    if len(sn["ha"]) >= 3:
+        if sn["ha_g3"] == 3:
             score += 1
-        elif all(not c["green"] for c in last3):
+        elif sn["ha_g3"] == 0:
             score -= 1
 
     if score >= TREND_THRESH:
@@ -87,8 +119,8 @@ def _score_trend(st):
         return score, "NEUTRAL",  "yellow"
 
 
-def _header(st, coin, tf):
-    score, label, col = _score_trend(st)
+def _header(st, coin, tf, sn):
+    score, label, col = sn["trend"]
 
     parts = [
         (f"  {coin} ", "bold white on dark_blue"),
@@ -113,9 +145,9 @@ def _header(st, coin, tf):
     )
 
 
-def _ob_panel(st):
-    obi_v      = ind.obi(st.bids, st.asks, st.mid) if st.mid else 0.0
-    bw, aw     = ind.walls(st.bids, st.asks)
+def _ob_panel(st, sn):
+    obi_v      = sn["obi"]
+    bw, aw     = sn["walls"]
     dep        = ind.depth_usd(st.bids, st.asks, st.mid) if st.mid else {}
 
     if obi_v > config.OBI_THRESH:
@@ -135,7 +167,7 @@ def _ob_panel(st):
               f"[{oc}]{os}[/{oc}]")
 
     for pct in config.DEPTH_BANDS:
-        t.add_row(f"Depth {pct}%", _p(dep.get(pct, 0)), "")
+        t.add_row(_DEPTH_LABELS[pct], _p(dep.get(pct, 0)), "")
 
     if bw:
         t.add_row("BUY walls",
@@ -151,9 +183,9 @@ def _ob_panel(st):
     return Panel(t, title="ORDER BOOK", box=bx.ROUNDED, expand=True)
 
 
-def _flow_panel(st):
-    cvds = {s: ind.cvd(st.trades, s) for s in config.CVD_WINDOWS}
-    poc, vp = ind.vol_profile(st.klines)
+def _flow_panel(st, sn):
+    cvds = {s: ind.cvd(st.trade_t, st.trade_cum, s) for s in config.CVD_WINDOWS}
+    poc, vp = sn["vp"]
 
     t = Table(box=None, show_header=False, pad_edge=False, expand=True)
     t.add_column("label", style="dim", width=16)
@@ -163,11 +195,11 @@ def _flow_panel(st):
     for secs in config.CVD_WINDOWS:
         v  = cvds[secs]
         c  = _col(v)
-        t.add_row(f"CVD {secs // 60}m",
+        t.add_row(_CVD_LABELS[secs],
                   f"[{c}]{_p(v)}[/{c}]",
                   f"[{c}]{'↑' if v > 0 else '↓'}[/{c}]")
 
-    delta_v = ind.cvd(st.trades, config.DELTA_WINDOW)
+    delta_v = ind.cvd(st.trade_t, st.trade_cum, config.DELTA_WINDOW)
     dc = _col(delta_v)
     t.add_row("Delta 1m",
               f"[{dc}]{_p(delta_v)}[/{dc}]",
@@ -176,8 +208,8 @@ def _flow_panel(st):
     t.add_row("POC", f"[bold]{_p(poc)}[/bold]", "")
 
     if vp:
-        max_v  = max(v for _, v in vp) or 1
-        poc_i  = min(range(len(vp)), key=lambda i: abs(vp[i][0] - poc))
+        max_v  = sn["vp_max"]
+        poc_i  = sn["vp_poc"]
         half   = config.VP_SHOW // 2
         start  = max(0, poc_i - half)
         end    = min(len(vp), start + config.VP_SHOW)
@@ -185,8 +217,7 @@ def _flow_panel(st):
 
         for i in range(end - 1, start - 1, -1):
             p, v = vp[i]
-            bar_len = int(v / max_v * 14)
-            bar     = "█" * bar_len + "░" * (14 - bar_len)
+            bar     = _BARS[int(v / max_v * BAR_W)]
             is_poc  = i == poc_i
             style   = "green bold" if is_poc else "dim"
             marker  = " ◄ POC" if is_poc else ""
@@ -196,12 +227,12 @@ def _flow_panel(st):
     return Panel(t, title="FLOW & VOLUME", box=bx.ROUNDED, expand=True)
 
 
-def _ta_panel(st):
-    rsi_v              = ind.rsi(st.klines)
-    macd_v, sig_v, hv  = ind.macd(st.klines)
-    vwap_v             = ind.vwap(st.klines)
-    ema_s, ema_l       = ind.emas(st.klines)
-    ha                 = ind.heikin_ashi(st.klines)
+def _ta_panel(st, sn):
+    rsi_v              = sn["rsi"]
+    macd_v, sig_v, hv  = sn["macd"]
+    vwap_v             = sn["vwap"]
+    ema_s, ema_l       = sn["emas"]
+    ha                 = sn["ha"]
 
     t = Table(box=None, show_header=False, pad_edge=False, expand=True)
     t.add_column("label",  style="dim", width=16)
@@ -242,7 +273,7 @@ def _ta_panel(st):
     if ha:
         last = ha[-config.HA_COUNT:]
         dots = " ".join("[green]▲[/green]" if c["green"] else "[red]▼[/red]" for c in last)
-        green_tail = sum(1 for c in last[-3:] if c["green"])
+        green_tail = sn["ha_g3"]
         hc   = "green" if green_tail >= 2 else "red"
         hs   = "trend ↑" if green_tail >= 2 else "trend ↓"
         t.add_row("Heikin Ashi", dots, f"[{hc}]{hs}[/{hc}]")
@@ -250,67 +281,64 @@ def _ta_panel(st):
     return Panel(t, title="TECHNICAL", box=bx.ROUNDED, expand=True)
 
 
-def _signals_panel(st):
+def _signals_panel(st, sn):
     sigs = []
 
-    obi_v = ind.obi(st.bids, st.asks, st.mid) if st.mid else 0.0
+    obi_v = sn["obi"]
     if abs(obi_v) > config.OBI_THRESH:
         c = "green" if obi_v > 0 else "red"
         d = "BULLISH" if obi_v > 0 else "BEARISH"
         sigs.append(f"[{c}]OBI → {d} ({obi_v * 100:+.1f} %)[/{c}]")
 
-    cvd5 = ind.cvd(st.trades, 300)
+    cvd5 = sn["cvd5"]
     if cvd5 != 0:
         c = "green" if cvd5 > 0 else "red"
         d = "buy pressure" if cvd5 > 0 else "sell pressure"
         sigs.append(f"[{c}]CVD 5m → {d} ({_p(cvd5)})[/{c}]")
 
-    rsi_v = ind.rsi(st.klines)
+    rsi_v = sn["rsi"]
     if rsi_v is not None:
         if rsi_v > config.RSI_OB:
             sigs.append(f"[red]RSI → overbought ({rsi_v:.0f})[/red]")
         elif rsi_v < config.RSI_OS:
             sigs.append(f"[green]RSI → oversold ({rsi_v:.0f})[/green]")
 
-    _, _, hv = ind.macd(st.klines)
+    _, _, hv = sn["macd"]
     if hv is not None:
         c = "green" if hv > 0 else "red"
         d = "bullish" if hv > 0 else "bearish"
         sigs.append(f"[{c}]MACD hist → {d}[/{c}]")
 
-    vwap_v = ind.vwap(st.klines)
+    vwap_v = sn["vwap"]
     if vwap_v and st.mid:
         c = "green" if st.mid > vwap_v else "red"
         d = "above" if st.mid > vwap_v else "below"
         sigs.append(f"[{c}]Price {d} VWAP[/{c}]")
 
-    es, el = ind.emas(st.klines)
+    es, el = sn["emas"]
     if es is not None and el is not None:
         c = "green" if es > el else "red"
         d = "golden" if es > el else "death"
         sigs.append(f"[{c}]EMA → {d} cross[/{c}]")
 
-    bw, aw = ind.walls(st.bids, st.asks)
+    bw, aw = sn["walls"]
     if bw:
         sigs.append(f"[green]BUY wall × {len(bw)} levels[/green]")
     if aw:
         sigs.append(f"[red]SELL wall × {len(aw)} levels[/red]")
 
-    ha = ind.heikin_ashi(st.klines)
-    if len(ha) >= 3:
-        last3 = ha[-3:]
-        if all(c["green"] for c in last3):
+    if len(sn["ha"]) >= 3:
+        if sn["ha_g3"] == 3:
             sigs.append("[green]HA → 3+ green candles (up streak)[/green]")
-        elif all(not c["green"] for c in last3):
+        elif sn["ha_g3"] == 0:
             sigs.append("[red]HA → 3+ red candles (down streak)[/red]")
 
     if not sigs:
         sigs.append("[dim]No active signals[/dim]")
 
-    score, label, col = _score_trend(st)
+    score, label, col = sn["trend"]
     max_score = 10
-    filled = int(min(abs(score), max_score) / max_score * 14)
-    bar    = "█" * filled + "░" * (14 - filled)
+    bar    = _BARS[int(min(abs(score), max_score) / max_score * BAR_W)]
     sigs.append("[dim]─────────────────────────────[/dim]")
     sigs.append(f"[{col} bold]TREND: {label}[/{col} bold]  "
                 f"[{col}]{bar}[/{col}]  [{col}]{score:+d}[/{col}]")
@@ -318,15 +346,26 @@ def _signals_panel(st):
     return Panel("\n".join(sigs), title="SIGNALS", box=bx.ROUNDED, expand=True)
 
 
+def _snapshot(st) -> dict:
+    # every indicator the panels share, evaluated once per frame
+    sn = dict(_kl(st.klines))
+    sn["obi"]   = ind.obi(st.bids, st.asks, st.mid) if st.mid else 0.0
+    sn["walls"] = ind.walls(st.bids, st.asks)
+    sn["cvd5"]  = ind.cvd(st.trade_t, st.trade_cum, 300)
+    sn["trend"] = _score_trend(st, sn)
+    return sn
+
+
 def render(st, coin, tf) -> "_Group":
-    header = _header(st, coin, tf)
+    sn     = _snapshot(st)
+    header = _header(st, coin, tf, sn)
 
     grid = Table(box=None, pad_edge=False, show_header=False, expand=True)
     grid.add_column(ratio=1)
     grid.add_column(ratio=1)
     grid.add_row(
-        Group(_ob_panel(st), _ta_panel(st)),
-        _flow_panel(st),
+        Group(_ob_panel(st, sn), _ta_panel(st, sn)),
+        _flow_panel(st, sn),
     )
 
-    return _Group(header, grid, _signals_panel(st))
+    return _Group(header, grid, _signals_panel(st, sn))
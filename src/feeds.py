@@ -1,21 +1,37 @@
 import asyncio
 import json
+import logging
 import time
+from bisect import bisect_left
+from functools import lru_cache
 
-import requests
+import httpx
 import websockets
 from datetime import datetime, timezone, timedelta
 
+try:
+    from orjson import loads
+except ImportError:
+    from json import loads
+
 import config
 
+log = logging.getLogger(__name__)
+
 
 class State:
+    __slots__ = ("bids", "asks", "mid", "trade_t", "trade_cum", "klines", "cur_kline",
+                 "pm_up_id", "pm_dn_id", "pm_up", "pm_dn", "pm_updated", "dirty")
+
     def __init__(self):
         self.bids: list[tuple[float, float]] = []
         self.asks: list[tuple[float, float]] = []
         self.mid: float = 0.0
 
-        self.trades: list[dict] = []
+        # trade times and running signed notional: trade_cum[i] is the total
+        # before trade i, trade_cum[-1] the total so far (one extra entry)
+        self.trade_t:   list[float] = []
+        self.trade_cum: list[float] = [0.0]
 
         self.klines: list[dict] = []
         self.cur_kline: dict | None = None
@@ -24,71 +40,78 @@ class State:
         self.pm_dn_id:  str | None = None
         self.pm_up:     float | None = None
         self.pm_dn:     float | None = None
+        self.pm_updated = asyncio.Event()
 
+        # set by kline/depth/PM updates, cleared by display_loop; trades alone
+        # don't mark it – windowed CVD rides along with the next render
+        self.dirty: bool = True
 
-OB_POLL_INTERVAL = 2
 
-
-async def ob_poller(symbol: str, state: State):
-    url = f"{config.BINANCE_REST}/depth"
-    print(f"  [Binance OB] polling {symbol} every {OB_POLL_INTERVAL}s")
-    while True:
-        try:
-            resp = requests.get(url, params={"symbol": symbol, "limit": 20}, timeout=3).json()
-            state.bids = [(float(p), float(q)) for p, q in resp["bids"]]
-            state.asks = [(float(p), float(q)) for p, q in resp["asks"]]
-            if state.bids and state.asks:
-                state.mid = (state.bids[0][0] + state.asks[0][0]) / 2
-        except Exception:
-            pass
-        await asyncio.sleep(OB_POLL_INTERVAL)
+# shared keep-alive / HTTP/2 client for every REST call in the app
+http_client = httpx.AsyncClient(
+    timeout=10,
+    transport=httpx.AsyncHTTPTransport(http2=True, retries=2),
+)
 
 
 async def binance_feed(symbol: str, kline_iv: str, state: State):
     sym = symbol.lower()
-    streams = "/".join([
-        f"{sym}@trade",
-        f"{sym}@kline_{kline_iv}",
-    ])
-    url = f"{config.BINANCE_WS}?streams={streams}"
-
-    async with websockets.connect(url, ping_interval=20) as ws:
-        print(f"  [Binance WS] connected – {symbol}")
+    # exact stream name -> handler; one dict lookup routes each frame
+    handlers = {
+        f"{sym}@trade":                         _bn_trade,
+        f"{sym}@kline_{kline_iv}":              _bn_kline,
+        f"{sym}@depth{config.OB_LEVELS}@100ms": _bn_depth,
+    }
+    url = f"{config.BINANCE_WS}?streams={'/'.join(handlers)}"
+
+    # trade frames are a few hundred bytes – inflating them costs more than it saves
+    async with websockets.connect(url, ping_interval=20, compression=None) as ws:
+        log.info(f"  [Binance WS] connected – {symbol}")
         while True:
-            data   = json.loads(await ws.recv())
-            stream = data.get("stream", "")
-            pay    = data["data"]
-
-            if "@trade" in stream:
-                state.trades.append({
-                    "t":      pay["T"] / 1000.0,
-                    "price":  float(pay["p"]),
-                    "qty":    float(pay["q"]),
-                    "is_buy": not pay["m"],
-                })
-                if len(state.trades) > 5000:
-                    cut = time.time() - config.TRADE_TTL
-                    state.trades = [t for t in state.trades if t["t"] >= cut]
-
-            elif "@kline" in stream:
-                k = pay["k"]
-                candle = {
-                    "t": k["t"] / 1000.0,
-                    "o": float(k["o"]), "h": float(k["h"]),
-                    "l": float(k["l"]), "c": float(k["c"]),
-                    "v": float(k["v"]),
-                }
-                state.cur_kline = candle
-                if k["x"]:
-                    state.klines.append(candle)
-                    state.klines = state.klines[-config.KLINE_MAX:]
+            data    = loads(await ws.recv(decode=False))
+            handler = handlers.get(data.get("stream"))
+            if handler:
+                handler(data["data"], state)
+
+
+def _bn_trade(pay, state):
+    usd = float(pay["p"]) * float(pay["q"])
+    state.trade_t.append(pay["T"] / 1000.0)
+    state.trade_cum.append(state.trade_cum[-1] + (-usd if pay["m"] else usd))
+    if len(state.trade_t) > 5000:
+        i = bisect_left(state.trade_t, time.time() - config.TRADE_TTL)
+        del state.trade_t[:i]
+        del state.trade_cum[:i]
+
+
+def _bn_kline(pay, state):
+    k = pay["k"]
+    candle = {
+        "t": k["t"] / 1000.0,
+        "o": float(k["o"]), "h": float(k["h"]),
+        "l": float(k["l"]), "c": float(k["c"]),
+        "v": float(k["v"]),
+    }
+    state.cur_kline = candle
+    if k["x"]:
+        state.klines.append(candle)
+        state.klines = state.klines[-config.KLINE_MAX:]
+    state.dirty = True
+
+
+def _bn_depth(pay, state):
+    state.bids = [(float(p), float(q)) for p, q in pay["bids"]]
+    state.asks = [(float(p), float(q)) for p, q in pay["asks"]]
+    if state.bids and state.asks:
+        state.mid = (state.bids[0][0] + state.asks[0][0]) / 2
+    state.dirty = True
 
 
 async def bootstrap(symbol: str, interval: str, state: State):
-    resp = requests.get(
+    resp = loads((await http_client.get(
         f"{config.BINANCE_REST}/klines",
         params={"symbol": symbol, "interval": interval, "limit": config.KLINE_BOOT},
-    ).json()
+    )).content)
     state.klines = [
         {
             "t": r[0] / 1e3,
@@ -98,17 +121,19 @@ async def bootstrap(symbol: str, interval: str, state: State):
         }
         for r in resp
     ]
-    print(f"  [Binance] loaded {len(state.klines)} historical candles")
+    log.info(f"  [Binance] loaded {len(state.klines)} historical candles")
+
 
+_PERIOD_15M = 900
+_PERIOD_1H  = 3600
+_PERIOD_4H  = 14400
 
 _MONTHS = ["", "january", "february", "march", "april", "may", "june",
            "july", "august", "september", "october", "november", "december"]
 
 
-def _et_now() -> datetime:
-    utc = datetime.now(timezone.utc)
-    year = utc.year
-
+@lru_cache(maxsize=4)
+def _dst_bounds(year: int) -> tuple[datetime, datetime]:
     mar1_dow  = datetime(year, 3, 1).weekday()
     mar_sun   = 1 + (6 - mar1_dow) % 7
     dst_start = datetime(year, 3, mar_sun + 7, 2, 0, 0, tzinfo=timezone.utc)
@@ -116,7 +141,13 @@ def _et_now() -> datetime:
     nov1_dow = datetime(year, 11, 1).weekday()
     nov_sun  = 1 + (6 - nov1_dow) % 7
     dst_end  = datetime(year, 11, nov_sun, 6, 0, 0, tzinfo=timezone.utc)
+    return dst_start, dst_end
+
 
+def _et_now(utc: datetime | None = None) -> datetime:
+    if utc is None:
+        utc = datetime.now(timezone.utc)
+    dst_start, dst_end = _dst_bounds(utc.year)
     offset = timedelta(hours=-4) if dst_start <= utc < dst_end else timedelta(hours=-5)
     return utc + offset
 
@@ -134,14 +165,14 @@ def _to_12h(hour24: int) -> str:
 def _build_slug(coin: str, tf: str) -> str | None:
     now_utc = datetime.now(timezone.utc)
     now_ts  = int(now_utc.timestamp())
-    et      = _et_now()
+    et      = _et_now(now_utc)
 
     if tf == "15m":
-        ts = (now_ts // 900) * 900
+        ts = now_ts - now_ts % _PERIOD_15M
         return f"{config.COIN_PM[coin]}-updown-15m-{ts}"
 
     if tf == "4h":
-        ts = ((now_ts - 3600) // 14400) * 14400 + 3600
+        ts = now_ts - (now_ts - _PERIOD_1H) % _PERIOD_4H
         return f"{config.COIN_PM[coin]}-updown-4h-{ts}"
 
     if tf == "1h":
@@ -157,51 +188,66 @@ def _build_slug(coin: str, tf: str) -> str | None:
     return None
 
 
-def fetch_pm_tokens(coin: str, tf: str) -> tuple:
+async def fetch_pm_tokens(coin: str, tf: str) -> tuple:
     slug = _build_slug(coin, tf)
     if slug is None:
         return None, None
     try:
-        data = requests.get(config.PM_GAMMA, params={"slug": slug, "limit": 1}).json()
+        resp = await http_client.get(config.PM_GAMMA, params={"slug": slug, "limit": 1})
+        data = loads(resp.content)
         if not data or data[0].get("ticker") != slug:
-            print(f"  [PM] no active market for slug: {slug}")
+            log.warning(f"  [PM] no active market for slug: {slug}")
             return None, None
-        ids = json.loads(data[0]["markets"][0]["clobTokenIds"])
+        ids = loads(data[0]["markets"][0]["clobTokenIds"])
         return ids[0], ids[1]
     except Exception as e:
-        print(f"  [PM] token fetch failed ({slug}): {e}")
+        log.warning(f"  [PM] token fetch failed ({slug}): {e}")
         return None, None
 
 
 async def pm_feed(state: State):
     if not state.pm_up_id:
-        print("  [PM] no tokens for this coin/timeframe – skipped")
+        log.info("  [PM] no tokens for this coin/timeframe – skipped")
         return
 
-    assets = [state.pm_up_id, state.pm_dn_id]
-    async with websockets.connect(config.PM_WS, ping_interval=20) as ws:
-        await ws.send(json.dumps({"assets_ids": assets, "type": "market"}))
-        print("  [PM] connected")
-        while True:
-            raw = json.loads(await ws.recv())
-
-            if isinstance(raw, list):
-                for entry in raw:
-                    _pm_apply(entry.get("asset_id"), entry.get("asks", []), state)
-
-            elif isinstance(raw, dict) and raw.get("event_type") == "price_change":
-                for ch in raw.get("price_changes", []):
-                    if ch.get("best_ask"):
-                        _pm_set(ch["asset_id"], float(ch["best_ask"]), state)
-
-
-def _pm_apply(asset, asks, state):
-    if asks:
-        _pm_set(asset, min(float(a["price"]) for a in asks), state)
-
-
-def _pm_set(asset, price, state):
-    if asset == state.pm_up_id:
-        state.pm_up = price
-    elif asset == state.pm_dn_id:
-        state.pm_dn = price
+    # built once, resent as-is on every reconnect
+    sub     = json.dumps({"assets_ids": [state.pm_up_id, state.pm_dn_id], "type": "market"})
+    # asset id -> State attribute, so unknown assets are dropped before parsing
+    attr    = {state.pm_up_id: "pm_up", state.pm_dn_id: "pm_dn"}
+    backoff = config.PM_RECONNECT_MIN
+    while True:
+        try:
+            async with websockets.connect(config.PM_WS, ping_interval=20, compression="deflate",
+                                          max_size=config.PM_WS_MAX_SIZE) as ws:
+                await ws.send(sub)
+                log.info("  [PM] connected")
+                backoff = config.PM_RECONNECT_MIN
+                while True:
+                    _pm_handle(loads(await ws.recv(decode=False)), state, attr)
+        except Exception as e:
+            log.warning(f"  [PM] disconnected ({e}) – retry in {backoff}s")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, config.PM_RECONNECT_MAX)
+
+
+def _pm_handle(raw, state, attr):
+    if isinstance(raw, list):
+        for entry in raw:
+            _pm_apply(attr.get(entry.get("asset_id")), entry.get("asks", []), state)
+
+    elif isinstance(raw, dict) and raw.get("event_type") == "price_change":
+        for ch in raw.get("price_changes", []):
+            name = attr.get(ch.get("asset_id"))
+            if name and ch.get("best_ask"):
+                _pm_set(name, float(ch["best_ask"]), state)
+
+
+def _pm_apply(name, asks, state):
+    if name and asks:
+        _pm_set(name, min(float(a["price"]) for a in asks), state)
+
+
+def _pm_set(name, price, state):
+    setattr(state, name, price)
+    state.dirty = True
+    state.pm_updated.set()
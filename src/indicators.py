@@ -1,21 +1,32 @@
 import time
+from bisect import bisect_left
+
 import config
 
 
 def obi(bids, asks, mid):
+    # books are sorted best-first: plain loops that stop at the band edge
     band = mid * config.OBI_BAND_PCT / 100
-    bv = sum(q for p, q in bids if p >= mid - band)
-    av = sum(q for p, q in asks if p <= mid + band)
+    lo, hi = mid - band, mid + band
+    bv = 0.0
+    for p, q in bids:
+        if p < lo:
+            break
+        bv += q
+    av = 0.0
+    for p, q in asks:
+        if p > hi:
+            break
+        av += q
     tot = bv + av
     return (bv - av) / tot if tot else 0.0
 
 
 def walls(bids, asks):
-    vols = [q for _, q in bids] + [q for _, q in asks]
-    if not vols:
+    n = len(bids) + len(asks)
+    if not n:
         return [], []
-    avg = sum(vols) / len(vols)
-    thr = avg * config.WALL_MULT
+    thr = (sum(q for _, q in bids) + sum(q for _, q in asks)) / n * config.WALL_MULT
     return (
         [(p, q) for p, q in bids if q >= thr],
         [(p, q) for p, q in asks if q >= thr],
@@ -26,20 +37,24 @@ def depth_usd(bids, asks, mid):
     out = {}
     for pct in config.DEPTH_BANDS:
         band = mid * pct / 100
-        out[pct] = (
-            sum(p * q for p, q in bids if p >= mid - band)
-            + sum(p * q for p, q in asks if p <= mid + band)
-        )
+        lo, hi = mid - band, mid + band
+        usd = 0.0
+        for p, q in bids:
+            if p < lo:
+                break
+            usd += p * q
+        for p, q in asks:
+            if p > hi:
+                break
+            usd += p * q
+        out[pct] = usd
     return out
 
 
-def cvd(trades, secs):
-    cut = time.time() - secs
-    return sum(
-        t["qty"] * t["price"] * (1 if t["is_buy"] else -1)
-        for t in trades
-        if t["t"] >= cut
-    )
+def cvd(trade_t, trade_cum, secs):
+    # prefix sums: one bisect instead of a scan over every trade
+    i = bisect_left(trade_t, time.time() - secs)
+    return trade_cum[-1] - trade_cum[i]
 
 
 def vol_profile(klines):